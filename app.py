@@ -1,7 +1,8 @@
 """Flask app to display stock verdicts with expandable metrics and analysis."""
-import csv
-import json
+import threading
 from pathlib import Path
+
+import polars as pl
 from flask import Flask, render_template
 
 app = Flask(__name__)
@@ -10,37 +11,56 @@ DATA_DIR = Path(__file__).parent
 VERDICTS_FILE = DATA_DIR / "verdicts.csv"
 CACHE_FILE = DATA_DIR / "llm_readable_cache" / "cached.jsonl"
 
+_CACHE = {"key": None, "data": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def _mtime_ns(path: Path) -> int:
+    return path.stat().st_mtime_ns if path.exists() else 0
+
 
 def load_data():
+    """Load verdicts joined with cached analysis, reusing the result until either file changes."""
+    key = (_mtime_ns(VERDICTS_FILE), _mtime_ns(CACHE_FILE))
+    with _CACHE_LOCK:
+        if _CACHE["key"] != key:
+            _CACHE["data"] = _load_data()
+            _CACHE["key"] = key
+        return _CACHE["data"]
+
+
+def _load_data():
     """Load verdicts and cached analysis, joining by ticker."""
-    # Load cache into dict keyed by ticker
-    cache = {}
-    if CACHE_FILE.exists():
-        with open(CACHE_FILE, "r") as f:
-            for line in f:
-                if line.strip():
-                    entry = json.loads(line)
-                    cache[entry["ticker"]] = {
-                        "metrics_str": entry.get("metrics_str", ""),
-                        "analysis": entry.get("analysis", ""),
-                    }
-
-    # Load verdicts and join with cache
-    verdicts = []
-    if VERDICTS_FILE.exists():
-        with open(VERDICTS_FILE, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                ticker = row["ticker"]
-                cached = cache.get(ticker, {})
-                verdicts.append({
-                    "ticker": ticker,
-                    "date": row.get("date", ""),
-                    "comment": row.get("comment", ""),
-                    "metrics_str": cached.get("metrics_str", "No metrics available"),
-                    "analysis": cached.get("analysis", "No analysis available"),
-                })
-    return verdicts
+    if not VERDICTS_FILE.exists():
+        return []
+
+    lf_verdicts = pl.scan_csv(VERDICTS_FILE, infer_schema=False)
+    verdict_columns = lf_verdicts.collect_schema().names()
+    lf_verdicts = lf_verdicts.select(
+        "ticker",
+        # date and comment are optional columns
+        *(
+            (pl.col(c) if c in verdict_columns else pl.lit(None, pl.String)).fill_null("").alias(c)
+            for c in ("date", "comment")
+        ),
+    )
+
+    cache_schema = {"ticker": pl.String, "metrics_str": pl.String, "analysis": pl.String}
+    if CACHE_FILE.exists() and CACHE_FILE.stat().st_size > 0:
+        # The explicit schema turns keys missing from an entry into nulls.
+        # Later cache entries for the same ticker take precedence
+        lf_cache = (
+            pl.scan_ndjson(CACHE_FILE, schema=cache_schema)
+            .with_columns(pl.col("metrics_str", "analysis").fill_null(""))
+            .unique(subset="ticker", keep="last", maintain_order=True)
+        )
+    else:
+        lf_cache = pl.LazyFrame(schema=cache_schema)
+
+    return lf_verdicts.join(lf_cache, on="ticker", how="left", maintain_order="left").with_columns(
+        pl.col("metrics_str").fill_null("No metrics available"),
+        pl.col("analysis").fill_null("No analysis available"),
+    ).collect().to_dicts()
 
 
 @app.route("/")
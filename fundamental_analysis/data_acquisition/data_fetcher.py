@@ -1,9 +1,14 @@
 """Data fetcher orchestration for downloading and saving Sharadar data."""
 
-from datetime import datetime, timedelta
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import polars as pl
+import pyarrow.parquet as pq
 
 from fundamental_analysis.data_acquisition.sharadar_client import \
     SharadarClient
@@ -11,35 +16,51 @@ from fundamental_analysis.utils.config import Config
 from fundamental_analysis.utils.logger import setup_logger
 
 _FETCH_START_DATE = "1998-01-01"
+_DATE_FORMAT = "%Y-%m-%d"
+_MONTH_FORMAT = "%Y-%m"
+# Several row groups per file lets readers decode in parallel; statistics enable predicate pushdown.
+# Files are written once and read many times, so a higher zstd level pays off.
+_PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 6,
+    "row_group_size": 64_000,
+    "statistics": True,
+}
 logger = setup_logger(__name__)
 
 
 class DataFetcher:
     """Orchestrates fetching and saving financial data."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = SharadarClient(api_key)
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
+        self.client = SharadarClient(api_key, use_cache=use_cache)
         Config.validate()
 
     def fetch_and_save_tickers(
         self,
         end_date: str,
-        overwrite: bool = False
+        overwrite: bool = False,
+        columns: Optional[list[str]] = None,
     ) -> pl.DataFrame:
-        """Fetch and save ticker metadata with end_date in filename."""
+        """
+        Fetch and save ticker metadata with end_date in filename.
+
+        columns: If set, only these columns are returned (and read from an existing file).
+        """
         logger.info("Fetching and saving TICKERS data...")
 
         output_path = Config.TICKERS_DIR / f"tickers_snapshot_{end_date}.parquet"
 
         if output_path.exists() and not overwrite:
             logger.info(f"File {output_path} already exists. Skipping (use --overwrite to replace).")
-            return pl.read_parquet(output_path)
+            return pl.read_parquet(output_path, columns=columns)
 
-        df_tickers = self.client.fetch_tickers()
-        df_tickers.write_parquet(output_path)
+        # Paginated fetches arrive as many small chunks; writing them as-is is far slower
+        df_tickers = self.client.fetch_tickers().rechunk()
+        df_tickers.write_parquet(output_path, **_PARQUET_WRITE_OPTIONS)
         logger.info(f"Saved {len(df_tickers)} tickers to {output_path}")
 
-        return df_tickers
+        return df_tickers if columns is None else df_tickers.select(columns)
 
     def fetch_and_save_sf1(
         self,
@@ -55,9 +76,9 @@ class DataFetcher:
         Saves as sf1_snapshot_{end_date}.parquet.
         """
 
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, _DATE_FORMAT)
         adjusted_end_dt = end_dt - timedelta(days=Config.REPORTING_DELAY_DAYS)
-        adjusted_end_date = adjusted_end_dt.strftime("%Y-%m-%d")
+        adjusted_end_date = adjusted_end_dt.strftime(_DATE_FORMAT)
 
         logger.info(f"Creating SF1 snapshot as of {end_date}")
         logger.info(f"Applying {Config.REPORTING_DELAY_DAYS}-day reporting delay: data cutoff = {adjusted_end_date}")
@@ -70,35 +91,90 @@ class DataFetcher:
 
         logger.info(f"Fetching all historical data from {_FETCH_START_DATE} to {adjusted_end_date}")
 
-        df_sf1 = self.client.fetch_sf1(
-            start_date=_FETCH_START_DATE,
-            end_date=adjusted_end_date,
-            tickers=tickers,
-        )
-
-        if len(df_sf1) == 0:
-            logger.warning("No SF1 data fetched. Skipping save.")
-            return
-
-        # Date fields in SF1:
-        # - reportperiod: actual fiscal quarter end (varies by company)
-        # - calendardate: normalized to calendar quarters (Mar/Jun/Sep/Dec 31)
-        # - datekey: when data became available in Sharadar (critical for point-in-time)
-        df_sf1 = df_sf1.with_columns([
-            pl.col("calendardate").cast(pl.Date),
-            pl.col("datekey").cast(pl.Date),
-            pl.col("reportperiod").cast(pl.Date)
-        ])
-
-        logger.info(f"Fetched {len(df_sf1)} records, filtering by datekey <= {adjusted_end_date}")
-
-        # Filter by datekey to ensure point-in-time correctness
-        df_sf1 = df_sf1.filter(pl.col("datekey") <= pl.lit(adjusted_end_dt).cast(pl.Date))
+        # Batches are written to a staging file as they arrive, so only the
+        # batches in flight are held in memory instead of the full history
+        staging_path = output_path.with_suffix(".parquet.part")
+        sink_path = output_path.with_suffix(".parquet.tmp")
+        try:
+            fetched_count = self._write_sf1_batches(
+                start_date=_FETCH_START_DATE,
+                end_date=adjusted_end_date,
+                tickers=tickers,
+                staging_path=staging_path,
+            )
+
+            if fetched_count == 0:
+                logger.warning("No SF1 data fetched. Skipping save.")
+                return
+
+            logger.info(f"Fetched {fetched_count} records, filtering by datekey <= {adjusted_end_date}")
+
+            # Date fields in SF1:
+            # - reportperiod: actual fiscal quarter end (varies by company)
+            # - calendardate: normalized to calendar quarters (Mar/Jun/Sep/Dec 31)
+            # - datekey: when data became available in Sharadar (critical for point-in-time)
+            # Sorting by datekey keeps per-row-group datekey ranges tight, so readers
+            # filtering on datekey can skip most row groups.
+            # Sink-then-rename, so a failed sink never leaves a truncated snapshot
+            # that later runs would skip as already existing
+            pl.scan_parquet(staging_path).filter(
+                pl.col("datekey") <= adjusted_end_dt.date()
+            ).sort("datekey").sink_parquet(sink_path, **_PARQUET_WRITE_OPTIONS)
+            sink_path.replace(output_path)
+        finally:
+            staging_path.unlink(missing_ok=True)
+            sink_path.unlink(missing_ok=True)
+
+        saved_count = pl.scan_parquet(output_path).select(pl.len()).collect().item()
+        logger.info(f"After datekey filter: {saved_count} records")
+        logger.info(f"Saved SF1 snapshot to {output_path}")
 
-        logger.info(f"After datekey filter: {len(df_sf1)} records")
+    def _write_sf1_batches(
+        self,
+        start_date: str,
+        end_date: str,
+        tickers: Optional[list[str]],
+        staging_path: Path,
+    ) -> int:
+        """
+        Fetch SF1 in concurrent ticker batches and append each to staging_path as it completes.
 
-        df_sf1.write_parquet(output_path)
-        logger.info(f"Saved SF1 snapshot to {output_path}")
+        Returns the number of rows written.
+        """
+        if tickers:
+            batch_size = Config.SF1_FETCH_TICKER_BATCH_SIZE
+            batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+            logger.info(f"Fetching SF1 for {len(tickers)} tickers in {len(batches)} batches")
+        else:
+            batches = [None]
+
+        writer = None
+        written = 0
+        try:
+            with ThreadPoolExecutor(max_workers=Config.FETCH_CONCURRENCY) as executor:
+                futures = [
+                    executor.submit(self.client.fetch_sf1, start_date=start_date, end_date=end_date, tickers=batch)
+                    for batch in batches
+                ]
+                for future in as_completed(futures):
+                    df = future.result()
+                    if len(df) == 0:
+                        continue
+
+                    table = df.with_columns([
+                        pl.col("calendardate").cast(pl.Date),
+                        pl.col("datekey").cast(pl.Date),
+                        pl.col("reportperiod").cast(pl.Date)
+                    ]).to_arrow()
+                    if writer is None:
+                        writer = pq.ParquetWriter(staging_path, table.schema, compression="zstd")
+                    writer.write_table(table.cast(writer.schema))
+                    written += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return written
 
     def fetch_and_save_sep(
         self,
@@ -113,68 +189,89 @@ class DataFetcher:
         Excludes the incomplete month containing end_date.
         """
 
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, _DATE_FORMAT)
         # Get last day of previous complete month
         first_day_current_month = end_dt.replace(day=1)
         last_day_previous_month = first_day_current_month - timedelta(days=1)
 
-        logger.info(f"Fetching SEP price data from {_FETCH_START_DATE} to {last_day_previous_month.strftime('%Y-%m-%d')}")
-        logger.info(f"Excluding incomplete month: {end_dt.strftime('%Y-%m')}")
+        logger.info(f"Fetching SEP price data from {_FETCH_START_DATE} to {last_day_previous_month.strftime(_DATE_FORMAT)}")
+        logger.info(f"Excluding incomplete month: {end_dt.strftime(_MONTH_FORMAT)}")
 
-        start_dt = datetime.strptime(_FETCH_START_DATE, "%Y-%m-%d")
+        start_dt = datetime.strptime(_FETCH_START_DATE, _DATE_FORMAT)
         end_dt = last_day_previous_month
 
-        current_dt = start_dt.replace(day=1)
-        fetched_count = 0
-        skipped_count = 0
+        # One directory scan instead of a stat() per month
+        existing_files = set() if overwrite else {
+            entry.name for entry in os.scandir(Config.SEP_DIR)
+            if entry.name.startswith("sep_") and entry.name.endswith(".parquet")
+        }
 
-        while current_dt <= end_dt:
-            month_str = current_dt.strftime("%Y-%m")
-            output_path = Config.SEP_DIR / f"sep_{month_str}.parquet"
-
-            # Check if file exists and skip if overwrite is False
-            if output_path.exists() and not overwrite:
-                logger.info(f"File {output_path.name} already exists. Skipping.")
+        missing_months = []
+        skipped_count = 0
+        for month_dt in _month_starts(start_dt, end_dt):
+            file_name = f"sep_{month_dt.strftime(_MONTH_FORMAT)}.parquet"
+            if file_name in existing_files:
+                logger.info(f"File {file_name} already exists. Skipping.")
                 skipped_count += 1
             else:
-                # Calculate first and last day of current month
-                fetch_start = current_dt.strftime("%Y-%m-01")
-
-                if current_dt.month == 12:
-                    next_month = current_dt.replace(year=current_dt.year + 1, month=1, day=1)
-                else:
-                    next_month = current_dt.replace(month=current_dt.month + 1, day=1)
-                last_day = next_month - timedelta(days=1)
-                fetch_end = last_day.strftime("%Y-%m-%d")
-
-                logger.info(f"Fetching SEP data for {month_str}: {fetch_start} to {fetch_end}")
-
-                df_sep = self.client.fetch_sep(
-                    start_date=fetch_start,
-                    end_date=fetch_end,
-                    tickers=tickers,
-                )
-
-                if len(df_sep) == 0:
-                    logger.warning(f"No SEP data fetched for {month_str}")
-                else:
-                    # Cast date to Date type
-                    df_sep = df_sep.with_columns(
-                        pl.col("date").cast(pl.Date)
-                    )
-
-                    df_sep.write_parquet(output_path)
-                    logger.info(f"Saved {len(df_sep)} SEP records to {output_path.name}")
-                    fetched_count += 1
-
-            # Move to next month
-            if current_dt.month == 12:
-                current_dt = current_dt.replace(year=current_dt.year + 1, month=1)
-            else:
-                current_dt = current_dt.replace(month=current_dt.month + 1)
+                missing_months.append(month_dt)
+
+        batches = _contiguous_month_batches(missing_months, Config.SEP_FETCH_BATCH_MONTHS)
+        # Converted once and shared by every batch's ticker filter
+        ticker_filter = pl.Series("ticker", tickers, dtype=pl.String) if tickers else None
+        # Batches are independent and network-bound, so several are fetched and written at once
+        with ThreadPoolExecutor(max_workers=Config.FETCH_CONCURRENCY) as executor:
+            fetched_count = sum(executor.map(
+                lambda batch: self._fetch_and_save_sep_batch(batch, ticker_filter),
+                batches,
+            ))
 
         logger.info(f"SEP fetch complete: {fetched_count} months fetched, {skipped_count} months skipped")
 
+    def _fetch_and_save_sep_batch(
+        self,
+        batch: list[date],
+        tickers: Optional[pl.Series],
+    ) -> int:
+        """Fetch a run of consecutive months in one request and save one file per month."""
+        fetch_start = batch[0].strftime(_DATE_FORMAT)
+        fetch_end = (_next_month(batch[-1]) - timedelta(days=1)).strftime(_DATE_FORMAT)
+
+        logger.info(f"Fetching SEP data for {len(batch)} month(s): {fetch_start} to {fetch_end}")
+
+        df_sep = self.client.fetch_sep(
+            start_date=fetch_start,
+            end_date=fetch_end,
+            tickers=tickers,
+        )
+
+        if len(df_sep) == 0:
+            logger.warning(f"No SEP data fetched for {fetch_start} to {fetch_end}")
+            return 0
+
+        df_sep = df_sep.with_columns(pl.col("date").cast(pl.Date)).with_columns(
+            (pl.col("date").dt.year() * 100 + pl.col("date").dt.month()).alias("_month")
+        )
+        # Split all months of the batch in one pass rather than filtering per month
+        parts = df_sep.partition_by("_month", as_dict=True, include_key=False)
+
+        saved_count = 0
+        for month_dt in batch:
+            month_str = month_dt.strftime(_MONTH_FORMAT)
+            df_month = parts.get((month_dt.year * 100 + month_dt.month,))
+            if df_month is None:
+                logger.warning(f"No SEP data fetched for {month_str}")
+                continue
+
+            output_path = Config.SEP_DIR / f"sep_{month_str}.parquet"
+            # Date order keeps row-group date statistics tight for reads that start or
+            # end mid-month; the sort also leaves the frame in one contiguous chunk
+            df_month.sort("date").write_parquet(output_path, **_PARQUET_WRITE_OPTIONS)
+            logger.info(f"Saved {len(df_month)} SEP records to {output_path.name}")
+            saved_count += 1
+
+        return saved_count
+
     def fetch_all(
         self,
         end_date: str,
@@ -185,7 +282,8 @@ class DataFetcher:
 
         df_tickers = self.fetch_and_save_tickers(
             end_date=end_date,
-            overwrite=overwrite
+            overwrite=overwrite,
+            columns=["ticker"],
         )
         active_tickers = df_tickers["ticker"].to_list()
         logger.info(f"Working with {len(active_tickers)} active tickers")
@@ -203,3 +301,29 @@ class DataFetcher:
         )
 
         logger.info("Full data fetch completed successfully")
+
+
+def _next_month(dt: date) -> date:
+    if dt.month == 12:
+        return dt.replace(year=dt.year + 1, month=1, day=1)
+    return dt.replace(month=dt.month + 1, day=1)
+
+
+def _month_starts(start_dt: datetime, end_dt: datetime) -> list[date]:
+    """First day of every month from start_dt's month through end_dt."""
+    return pl.date_range(start_dt.replace(day=1), end_dt, interval="1mo", eager=True).to_list()
+
+
+def _contiguous_month_batches(months: list[date], max_months: int) -> list[list[date]]:
+    """Group sorted month starts into runs of consecutive months, at most max_months long."""
+    if not months:
+        return []
+
+    month_index = np.array([m.year * 12 + m.month for m in months])
+    run_starts = np.flatnonzero(np.diff(month_index) != 1) + 1
+
+    batches = []
+    for run in np.split(np.arange(len(months)), run_starts):
+        for i in range(0, len(run), max_months):
+            batches.append([months[j] for j in run[i:i + max_months]])
+    return batches
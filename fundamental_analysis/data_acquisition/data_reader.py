@@ -1,6 +1,9 @@
 """Data reader for loading and filtering saved Sharadar data."""
 
+import functools
+import os
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
 import polars as pl
@@ -11,6 +14,33 @@ from fundamental_analysis.utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def _latest_snapshot_file(directory: Path, prefix: str) -> Optional[Path]:
+    """Return the most recent {prefix}YYYY-MM-DD.parquet file in directory."""
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    name = _latest_snapshot_name(str(directory), mtime_ns, prefix)
+    return directory / name if name else None
+
+
+@functools.lru_cache(maxsize=32)
+def _latest_snapshot_name(directory: str, mtime_ns: int, prefix: str) -> Optional[str]:
+    """
+    Directory listing behind _latest_snapshot_file, memoized per directory state.
+
+    mtime_ns only keys the cache: adding, removing or renaming a snapshot changes
+    the directory mtime, so a stale listing is never reused.
+    ISO dates sort lexicographically, so the latest file is the max name.
+    """
+    names = [
+        name for name in os.listdir(directory)
+        if name.startswith(prefix) and name.endswith(".parquet")
+    ]
+    return max(names) if names else None
+
+
 class DataReader:
     """Reads and filters locally stored financial data."""
 
@@ -27,15 +57,11 @@ class DataReader:
 
         Uses the most recent tickers file available.
         """
-        # Find all tickers files
-        tickers_files = sorted(Config.TICKERS_DIR.glob("tickers_snapshot_*.parquet"))
+        selected_file = _latest_snapshot_file(Config.TICKERS_DIR, "tickers_snapshot_")
 
-        if not tickers_files:
+        if selected_file is None:
             raise FileNotFoundError(f"No tickers files found in {Config.TICKERS_DIR}")
 
-        # Use the most recent tickers file
-        selected_file = tickers_files[-1]
-
         logger.info(f"Reading tickers from {selected_file.name}")
         return pl.read_parquet(selected_file)
 
@@ -61,45 +87,42 @@ class DataReader:
         end_dt = datetime.strptime(end_date, "%Y-%m-%d")
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
 
-        # Find the most recent snapshot file (contains all historical data)
-        snapshot_files = sorted(Config.SF1_DIR.glob("sf1_snapshot_*.parquet"))
-
-        if not snapshot_files:
-            raise FileNotFoundError(f"No SF1 snapshot files found in {Config.SF1_DIR}")
-
         # Use the most recent snapshot - it contains all historical data
         # Point-in-time filtering is done via datekey column
-        selected_file = snapshot_files[-1]
+        selected_file = _latest_snapshot_file(Config.SF1_DIR, "sf1_snapshot_")
+
+        if selected_file is None:
+            raise FileNotFoundError(f"No SF1 snapshot files found in {Config.SF1_DIR}")
 
         logger.info(f"Reading SF1 from {selected_file.name}")
-        df = pl.read_parquet(selected_file)
 
-        # Filter by datekey
-        df = df.filter(
+        # Both filters run inside the scan as one predicate, so row groups outside
+        # the datekey window are skipped and no intermediate frame is materialized
+        predicate = (
             (pl.col("datekey") >= pl.lit(start_dt).cast(pl.Date)) &
             (pl.col("datekey") <= pl.lit(end_dt).cast(pl.Date))
         )
-
-        logger.info(f"After datekey filter ({start_date} to {end_date}): {len(df)} records")
-
-        # Filter by max data delay if specified
         if max_data_delay_days is not None:
-            df = df.with_columns(
-                (pl.col("datekey") - pl.col("reportperiod")).dt.total_days().alias("_delay_days")
+            predicate &= (
+                (pl.col("datekey") - pl.col("reportperiod")).dt.total_days() <= max_data_delay_days
             )
 
-            original_count = len(df)
-            df = df.filter(pl.col("_delay_days") <= max_data_delay_days)
-            df = df.drop("_delay_days")
+        df = pl.scan_parquet(selected_file).filter(predicate).collect()
 
-            logger.info(
-                f"After max_data_delay_days filter ({max_data_delay_days} days): "
-                f"{len(df)} records (removed {original_count - len(df)})"
-            )
+        delay_note = "" if max_data_delay_days is None else f", max_data_delay_days={max_data_delay_days}"
+        logger.info(f"After datekey filter ({start_date} to {end_date}{delay_note}): {len(df)} records")
 
-        # Keep only first datekey for each (ticker, reportperiod) combination
+        # Keep only first datekey for each (ticker, reportperiod) combination.
+        # On the sorted frame that is the first row of each run, found by comparing
+        # with the previous row instead of hashing the key of every row.
+        # Preserving the sort order lets the (ticker, reportperiod) sort in
+        # calculate_all_metrics hit Polars' presorted fast path, and the ticker
+        # flag lets per-ticker window expressions skip re-grouping.
         df = df.sort(["ticker", "reportperiod", "datekey"])
-        df = df.unique(subset=["ticker", "reportperiod"], keep="first")
+        df = df.filter(
+            pl.col("ticker").ne_missing(pl.col("ticker").shift(1)) |
+            pl.col("reportperiod").ne_missing(pl.col("reportperiod").shift(1))
+        ).set_sorted("ticker")
 
         logger.info(f"After deduplication (first datekey per ticker-reportperiod): {len(df)} records")
 
@@ -127,23 +150,17 @@ class DataReader:
         start_month = start_dt.strftime("%Y-%m")
         end_month = end_dt.strftime("%Y-%m")
 
-        # Generate list of months to read
-        current_dt = start_dt.replace(day=1)
+        month_strs = pl.date_range(
+            start_dt.replace(day=1), end_dt, interval="1mo", eager=True
+        ).dt.strftime("%Y-%m")
         months_to_read = []
 
-        while current_dt <= end_dt:
-            month_str = current_dt.strftime("%Y-%m")
+        for month_str in month_strs:
             file_path = Config.SEP_DIR / f"sep_{month_str}.parquet"
 
             if file_path.exists():
                 months_to_read.append(file_path)
 
-            # Move to next month
-            if current_dt.month == 12:
-                current_dt = current_dt.replace(year=current_dt.year + 1, month=1)
-            else:
-                current_dt = current_dt.replace(month=current_dt.month + 1)
-
         if not months_to_read:
             raise FileNotFoundError(
                 f"No SEP files found for date range {start_date} to {end_date}"
@@ -151,15 +168,12 @@ class DataReader:
 
         logger.info(f"Reading {len(months_to_read)} monthly SEP files from {start_month} to {end_month}")
 
-        # Read all monthly files and concatenate
-        dfs = [pl.read_parquet(file_path) for file_path in months_to_read]
-        df = pl.concat(dfs)
-
-        # Filter by exact date range
-        df = df.filter(
+        # One scan over all monthly files decodes them in parallel and
+        # applies the exact date range as a pushed-down predicate
+        df = pl.scan_parquet(months_to_read).filter(
             (pl.col("date") >= pl.lit(start_dt).cast(pl.Date)) &
             (pl.col("date") <= pl.lit(end_dt).cast(pl.Date))
-        )
+        ).collect()
 
         logger.info(f"After date filter ({start_date} to {end_date}): {len(df)} records")
 
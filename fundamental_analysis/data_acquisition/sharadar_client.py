@@ -1,9 +1,15 @@
 """Sharadar API client for fetching financial data from NASDAQ Data Link."""
 
+import copy
+import hashlib
+import json
+import time
 from typing import Optional
 
 import nasdaqdatalink
 import polars as pl
+from nasdaqdatalink.errors.data_link_error import LimitExceededError
+from nasdaqdatalink.model.datatable import Datatable
 
 from fundamental_analysis.utils.config import Config
 from fundamental_analysis.utils.logger import setup_logger
@@ -11,32 +17,118 @@ from fundamental_analysis.utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def _get_table(datatable_code: str, **query_params) -> pl.DataFrame:
+    """
+    Paginated datatable fetch built directly into Polars.
+
+    Mirrors nasdaqdatalink.get_table(paginate=True) but builds the frame in
+    Polars instead of pandas. The client already parses date cells into
+    datetime.date, so Date columns usually arrive as pl.Date.
+    """
+    pages = []
+    page_count = 0
+    while True:
+        data = Datatable(datatable_code).data(params=copy.deepcopy(query_params))
+        columns, column_types = data.columns, data.column_types
+        rows = data.to_list()
+        if rows:
+            pages.append(
+                pl.DataFrame(rows, schema=columns, orient="row", infer_schema_length=None)
+            )
+
+        if page_count >= nasdaqdatalink.ApiConfig.page_limit:
+            raise LimitExceededError(
+                f"Data limit exceeded for {datatable_code}; "
+                "narrow the query or use bulk export"
+            )
+
+        next_cursor_id = data.meta["next_cursor_id"]
+        if next_cursor_id is None:
+            break
+        page_count += 1
+        query_params["qopts.cursor_id"] = next_cursor_id
+
+    if not pages:
+        return pl.DataFrame(schema={c: pl.String for c in columns})
+
+    # Dtypes come from the datatable metadata rather than inference, so every
+    # query yields the same schema even when a column is all-null in it
+    df = pl.concat(pages, how="vertical_relaxed")
+    schema = df.schema
+    return df.with_columns(
+        # Only all-null or unparsed Date columns need converting
+        pl.col(c).cast(pl.String).str.to_date("%Y-%m-%d") if t == "Date"
+        else pl.col(c).cast(_polars_dtype(t), strict=False)
+        for c, t in zip(columns, column_types)
+        if not (t == "Date" and schema[c] == pl.Date)
+    )
+
+
+def _polars_dtype(column_type: str) -> pl.DataType:
+    """Map a datatable column type (e.g. 'BigDecimal(34,12)', 'Integer') to a Polars dtype."""
+    column_type = column_type.lower()
+    if column_type.startswith(("bigdecimal", "decimal", "double", "float")):
+        return pl.Float64
+    if column_type in ("integer", "int", "long"):
+        return pl.Int64
+    return pl.String
+
+
 class SharadarClient:
     """Client for fetching data from Sharadar via NASDAQ Data Link."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
         """
         Initialize Sharadar client.
 
         api_key: NASDAQ Data Link API key. If None, uses Config.NASDAQ_API_KEY
+        use_cache: Serve repeated queries from the on-disk response cache in Config.API_CACHE_DIR
         """
         self.api_key = api_key or Config.NASDAQ_API_KEY
         if not self.api_key:
             raise ValueError("NASDAQ API key is required")
+        self.use_cache = use_cache
 
         nasdaqdatalink.ApiConfig.api_key = self.api_key
         logger.info("SharadarClient initialized")
 
+    def _cached_get_table(
+        self,
+        datatable_code: str,
+        ttl_seconds: float,
+        **query_params,
+    ) -> pl.DataFrame:
+        """_get_table behind a Parquet cache keyed by the query, reused for ttl_seconds."""
+        if not self.use_cache:
+            return _get_table(datatable_code, **query_params)
+
+        query_key = json.dumps([datatable_code, query_params], sort_keys=True)
+        cache_path = Config.API_CACHE_DIR / (
+            f"{datatable_code.replace('/', '_')}_{hashlib.md5(query_key.encode()).hexdigest()}.parquet"
+        )
+
+        if cache_path.exists():
+            if time.time() - cache_path.stat().st_mtime < ttl_seconds:
+                logger.info(f"Using cached {datatable_code} response {cache_path.name}")
+                return pl.read_parquet(cache_path)
+            # Expired entries are removed rather than left to accumulate
+            cache_path.unlink(missing_ok=True)
+
+        df = _get_table(datatable_code, **query_params)
+
+        # Write-then-rename so concurrent fetches never read a partial file
+        tmp_path = cache_path.with_suffix(f".{time.monotonic_ns()}.tmp")
+        df.write_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+
+        return df
+
     def fetch_tickers(self, exclude_delisted: bool = False) -> pl.DataFrame:
         """Fetch ticker metadata, optionally excluding delisted companies."""
         logger.info("Fetching TICKERS table...")
 
         try:
-            df_pandas = nasdaqdatalink.get_table(
-                Config.SHARADAR_TICKERS,
-                paginate=True
-            )
-            df = pl.from_pandas(df_pandas)
+            df = self._cached_get_table(Config.SHARADAR_TICKERS, Config.API_CACHE_TTL_SECONDS)
 
             logger.info(f"Fetched {len(df)} tickers")
 
@@ -71,24 +163,18 @@ class SharadarClient:
                 "calendardate.gte": start_date,
                 "calendardate.lte": end_date,
                 "dimension": dimension,
-                "paginate": True,
             }
 
             if tickers:
                 logger.info(f"Filtering for {len(tickers)} tickers")
+                query_params["ticker"] = tickers
 
-            df_pandas = nasdaqdatalink.get_table(
-                Config.SHARADAR_SF1,
-                **query_params
-            )
-            df = pl.from_pandas(df_pandas)
+            # Not cached: the sf1_snapshot file DataFetcher writes already is the
+            # on-disk copy, and each run queries a new end date
+            df = _get_table(Config.SHARADAR_SF1, **query_params)
 
             logger.info(f"Fetched {len(df)} SF1 records")
 
-            if tickers:
-                df = df.filter(pl.col("ticker").is_in(tickers))
-                logger.info(f"Filtered to {len(df)} records for specified tickers")
-
             return df
 
         except Exception as e:
@@ -99,27 +185,32 @@ class SharadarClient:
         self,
         start_date: str,
         end_date: str,
-        tickers: Optional[list[str]] = None,
+        tickers: Optional[list[str] | pl.Series] = None,
     ) -> pl.DataFrame:
-        """Fetch daily price data from SEP table for given date range."""
+        """
+        Fetch daily price data from SEP table for given date range.
+
+        tickers: Optional filter; pass a pl.Series when calling repeatedly to avoid
+            converting the same Python list on every call
+        """
         logger.info(f"Fetching SEP price data for {start_date} to {end_date}")
 
         try:
             query_params = {
                 "date.gte": start_date,
                 "date.lte": end_date,
-                "paginate": True,
             }
 
-            df_pandas = nasdaqdatalink.get_table(
-                Config.SHARADAR_SEP,
-                **query_params
-            )
-            df = pl.from_pandas(df_pandas)
+            # Not cached: the sep_YYYY-MM files DataFetcher writes already are the
+            # on-disk copy, and months present there are never refetched
+            df = _get_table(Config.SHARADAR_SEP, **query_params)
 
             logger.info(f"Fetched {len(df)} SEP price records")
 
-            if tickers:
+            if tickers is not None and len(tickers) > 0:
+                # A Series is passed as one list value; is_in on a bare Series is deprecated
+                if isinstance(tickers, pl.Series):
+                    tickers = tickers.implode()
                 df = df.filter(pl.col("ticker").is_in(tickers))
                 logger.info(f"Filtered to {len(df)} records for specified tickers")
 
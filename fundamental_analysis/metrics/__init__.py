@@ -1,6 +1,7 @@
 """Metrics calculation for fundamental analysis."""
 
 import polars as pl
+import polars.selectors as cs
 
 from fundamental_analysis.metrics.earnings_metrics import (
     get_earnings_growth_expressions, get_earnings_snapshot_expressions)
@@ -16,21 +17,53 @@ from fundamental_analysis.metrics.profitability import (
 from fundamental_analysis.metrics.size_features import (
     SIZE_FEATURE_RAW_COLUMNS, get_size_growth_expressions,
     get_size_snapshot_expressions)
+from fundamental_analysis.metrics.temporal_utils import lag_expressions
 
 # Identifiers to keep from SF1 data
 IDENTIFIER_COLUMNS = ["ticker", "reportperiod", "datekey", "calendardate"]
 
+# Numeric SF1 inputs read by the metric expressions. Computing in Float32 halves
+# memory traffic through the metric passes; ratios need nowhere near 15 digits.
+# SIZE_FEATURE_RAW_COLUMNS stay Float64: they are passed through as dollar amounts,
+# which Float32 would round (to ~$2.6e5 at a $2.8T market cap).
+_FLOAT32_INPUT_COLUMNS = [
+    "price", "epsdil", "bvps", "sps", "cashneq", "sharesbas", "ev", "ebitda",
+    "debt", "assetsc", "liabilitiesc", "intexp", "ebit", "ebt", "taxexp", "netinccmn",
+]
+
+# Expressions are immutable and take no parameters, so they are built once at
+# import rather than on every calculate_all_metrics call
+_SNAPSHOT_EXPRESSIONS = (
+    get_size_snapshot_expressions()
+    + get_fundamental_ratio_snapshot_expressions()
+    + get_financial_health_snapshot_expressions()
+    + get_profitability_snapshot_expressions()
+    + get_earnings_snapshot_expressions()
+)
+_GROWTH_EXPRESSIONS = (
+    get_size_growth_expressions()
+    + get_fundamental_ratio_growth_expressions()
+    + get_financial_health_growth_expressions()
+    + get_profitability_growth_expressions()
+    + get_earnings_growth_expressions()
+)
+_LAG_MASK_EXPRESSIONS, _LAG_EXPRESSIONS = lag_expressions(_GROWTH_EXPRESSIONS)
+
+_SNAPSHOT_METRIC_NAMES = [expr.meta.output_name() for expr in _SNAPSHOT_EXPRESSIONS]
+_GROWTH_METRIC_NAMES = [expr.meta.output_name() for expr in _GROWTH_EXPRESSIONS]
+
 
 def calculate_all_metrics(
-    df: pl.DataFrame,
+    df: pl.DataFrame | pl.LazyFrame,
     include_snapshot_metrics: bool = True,
     include_growth_metrics: bool = True,
-) -> pl.DataFrame:
+) -> pl.DataFrame | pl.LazyFrame:
     """
     Calculate all available metrics from SF1 data in single pass.
 
     Args:
-        df: Input DataFrame with SF1 fundamental data
+        df: Input DataFrame with SF1 fundamental data. A LazyFrame input returns a
+            LazyFrame, so callers can chain further lazy steps before collecting.
         include_snapshot_metrics: If True, include snapshot (non-temporal) metrics
         include_growth_metrics: If True, include growth (temporal) metrics
 
@@ -42,11 +75,14 @@ def calculate_all_metrics(
     - Earnings (EPS growth QoQ/YoY)
 
     All calculations happen in a single pass for maximum efficiency.
+    Prefer this over applying the per-module get_*_expressions() helpers separately:
+    it sorts once and shares each per-ticker lag across all modules' growth metrics.
 
     Performance optimization: Input is sorted by (ticker, reportperiod) once upfront
     to avoid redundant sorting in temporal feature calculations (30+ operations).
+    DataReader.read_sf1 already returns rows in this order, which makes the sort cheap.
 
-    Returns DataFrame with ONLY identifiers and calculated metrics.
+    Returns a frame with ONLY identifiers and calculated metrics.
     All original SF1 columns are dropped after calculation.
 
     Note: Growth metrics require time-series data with multiple periods per ticker.
@@ -54,39 +90,55 @@ def calculate_all_metrics(
     Note: Price metrics from SEP data should be calculated separately using
           calculate_price_metrics() to ensure correct as-of-date alignment.
     """
-    # Sort once for efficient temporal calculations
-    df = df.sort("ticker", "reportperiod")
-
-    # Build expression list based on parameters
-    expressions = []
-
+    metric_columns = []
     if include_snapshot_metrics:
-        expressions.extend(get_size_snapshot_expressions())
-        expressions.extend(get_fundamental_ratio_snapshot_expressions())
-        expressions.extend(get_financial_health_snapshot_expressions())
-        expressions.extend(get_profitability_snapshot_expressions())
-        expressions.extend(get_earnings_snapshot_expressions())
-
+        metric_columns.extend(_SNAPSHOT_METRIC_NAMES)
+    if include_growth_metrics:
+        metric_columns.extend(_GROWTH_METRIC_NAMES)
+
+    # Staged so each ratio and each per-ticker shift is evaluated once: snapshot
+    # columns, then same-ticker masks and the lagged columns growth reads, then
+    # growth arithmetic.
+    # Snapshot and lag columns that are not selected are pruned by the lazy optimizer,
+    # as are SF1 columns that no metric reads.
+    lf = df.lazy()
+    schema = lf.collect_schema()
+    lf = (
+        lf.with_columns(
+            pl.col(c).cast(pl.Float32) for c in _FLOAT32_INPUT_COLUMNS if c in schema
+        )
+        .sort("ticker", "reportperiod")
+        .with_columns(_SNAPSHOT_EXPRESSIONS)
+    )
     if include_growth_metrics:
-        expressions.extend(get_size_growth_expressions())
-        expressions.extend(get_fundamental_ratio_growth_expressions())
-        expressions.extend(get_financial_health_growth_expressions())
-        expressions.extend(get_profitability_growth_expressions())
-        expressions.extend(get_earnings_growth_expressions())
-
-    # Calculate all metrics
-    df_with_metrics = df.with_columns(expressions)
-
-    # Get list of all calculated metric columns (new columns not in original)
-    metric_columns = [
-        col for col in df_with_metrics.columns
-        if col not in df.columns
-    ]
-
-    # Select: identifiers + size features (raw) + calculated metrics
+        lf = (
+            lf.with_columns(_LAG_MASK_EXPRESSIONS)
+            .with_columns(_LAG_EXPRESSIONS)
+            .with_columns(_GROWTH_EXPRESSIONS)
+        )
+
     # Note: SIZE_FEATURE_RAW_COLUMNS must be explicitly included since they exist in input df
-    return df_with_metrics.select(
-        IDENTIFIER_COLUMNS +
-        SIZE_FEATURE_RAW_COLUMNS +
-        metric_columns
+    # Numeric metric outputs are downcast to Float32 (the raw size columns stay Float64)
+    lf = lf.select(IDENTIFIER_COLUMNS + SIZE_FEATURE_RAW_COLUMNS + metric_columns).with_columns(
+        (cs.by_name(metric_columns) & cs.float()).cast(pl.Float32)
     )
+    return lf if isinstance(df, pl.LazyFrame) else lf.collect()
+
+
+def calculate_all_metrics_stream(
+    lf: pl.LazyFrame,
+    include_snapshot_metrics: bool = True,
+    include_growth_metrics: bool = True,
+) -> pl.DataFrame:
+    """
+    calculate_all_metrics for panels too large to hold in memory at once.
+
+    Pass a lazy scan (e.g. pl.scan_parquet of an SF1 snapshot); the plan is run on
+    the streaming engine, which processes the input in batches and lets the sort spill
+    instead of materializing every intermediate column for all tickers together.
+    """
+    return calculate_all_metrics(
+        lf,
+        include_snapshot_metrics=include_snapshot_metrics,
+        include_growth_metrics=include_growth_metrics,
+    ).collect(engine="streaming")
@@ -2,7 +2,7 @@
 
 import polars as pl
 
-from fundamental_analysis.metrics.temporal_utils import temporal_change
+from fundamental_analysis.metrics.temporal_utils import metric_stages, temporal_change
 
 
 def get_earnings_snapshot_expressions() -> list[pl.Expr]:
@@ -29,10 +29,8 @@ def get_earnings_growth_expressions() -> list[pl.Expr]:
     ]
 
 
-def get_earnings_expressions() -> list[pl.Expr]:
+def get_earnings_expressions() -> list[list[pl.Expr]]:
     """
-    Return all earnings metric expressions (snapshot + growth).
-
-    Use this for efficient batch calculation with other metric types.
+    Return all earnings metric expressions as ordered with_columns stages (see metric_stages).
     """
-    return get_earnings_snapshot_expressions() + get_earnings_growth_expressions()
+    return metric_stages(get_earnings_snapshot_expressions(), get_earnings_growth_expressions())
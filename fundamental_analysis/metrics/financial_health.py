@@ -2,35 +2,27 @@
 
 import polars as pl
 
-from fundamental_analysis.metrics.temporal_utils import temporal_change
+from fundamental_analysis.metrics.temporal_utils import metric_stages, temporal_change
 
 
 def _debt_to_equity_expr() -> pl.Expr:
     """Debt-to-Equity ratio: total debt / total equity."""
-    return pl.when(pl.col("equity") != 0).then(
-        pl.col("debt") / pl.col("equity")
-    ).otherwise(None)
+    return pl.col("debt") / pl.col("equity").replace(0, None)
 
 
 def _debt_to_assets_expr() -> pl.Expr:
     """Debt-to-Assets ratio: total debt / total assets."""
-    return pl.when(pl.col("assets") != 0).then(
-        pl.col("debt") / pl.col("assets")
-    ).otherwise(None)
+    return pl.col("debt") / pl.col("assets").replace(0, None)
 
 
 def _current_ratio_expr() -> pl.Expr:
     """Current Ratio: current assets / current liabilities."""
-    return pl.when(pl.col("liabilitiesc") != 0).then(
-        pl.col("assetsc") / pl.col("liabilitiesc")
-    ).otherwise(None)
+    return pl.col("assetsc") / pl.col("liabilitiesc").replace(0, None)
 
 
 def _interest_coverage_expr() -> pl.Expr:
     """Interest Coverage ratio: EBIT / interest expense."""
-    return pl.when(pl.col("intexp") != 0).then(
-        pl.col("ebit") / pl.col("intexp")
-    ).otherwise(None)
+    return pl.col("ebit") / pl.col("intexp").replace(0, None)
 
 
 def get_financial_health_snapshot_expressions() -> list[pl.Expr]:
@@ -56,23 +48,22 @@ def get_financial_health_growth_expressions() -> list[pl.Expr]:
     Return temporal growth expressions for financial health metrics.
 
     Includes growth (QoQ and YoY) for debt ratios, current ratio, and interest coverage.
+    Needs the snapshot and lag_expressions() stages applied first.
     """
     return [
-        temporal_change(_debt_to_equity_expr(), 1, check_sign_crossing=True).alias("debt_to_equity_growth_qoq"),
-        temporal_change(_debt_to_equity_expr(), 4, check_sign_crossing=True).alias("debt_to_equity_growth_yoy"),
-        temporal_change(_current_ratio_expr(), 1).alias("current_ratio_growth_qoq"),
-        temporal_change(_current_ratio_expr(), 4).alias("current_ratio_growth_yoy"),
-        temporal_change(_debt_to_assets_expr(), 1).alias("debt_to_assets_growth_qoq"),
-        temporal_change(_debt_to_assets_expr(), 4).alias("debt_to_assets_growth_yoy"),
-        temporal_change(_interest_coverage_expr(), 1, check_sign_crossing=True).alias("interest_coverage_growth_qoq"),
-        temporal_change(_interest_coverage_expr(), 4, check_sign_crossing=True).alias("interest_coverage_growth_yoy"),
+        temporal_change(pl.col("debt_to_equity"), 1, check_sign_crossing=True).alias("debt_to_equity_growth_qoq"),
+        temporal_change(pl.col("debt_to_equity"), 4, check_sign_crossing=True).alias("debt_to_equity_growth_yoy"),
+        temporal_change(pl.col("current_ratio"), 1).alias("current_ratio_growth_qoq"),
+        temporal_change(pl.col("current_ratio"), 4).alias("current_ratio_growth_yoy"),
+        temporal_change(pl.col("debt_to_assets"), 1).alias("debt_to_assets_growth_qoq"),
+        temporal_change(pl.col("debt_to_assets"), 4).alias("debt_to_assets_growth_yoy"),
+        temporal_change(pl.col("interest_coverage"), 1, check_sign_crossing=True).alias("interest_coverage_growth_qoq"),
+        temporal_change(pl.col("interest_coverage"), 4, check_sign_crossing=True).alias("interest_coverage_growth_yoy"),
     ]
 
 
-def get_financial_health_expressions() -> list[pl.Expr]:
+def get_financial_health_expressions() -> list[list[pl.Expr]]:
     """
-    Return all financial health metric expressions (snapshot + growth).
-
-    Use this for efficient batch calculation with other metric types.
+    Return all financial health metric expressions as ordered with_columns stages (see metric_stages).
     """
-    return get_financial_health_snapshot_expressions() + get_financial_health_growth_expressions()
+    return metric_stages(get_financial_health_snapshot_expressions(), get_financial_health_growth_expressions())
@@ -2,47 +2,37 @@
 
 import polars as pl
 
-from fundamental_analysis.metrics.temporal_utils import temporal_delta
+from fundamental_analysis.metrics.temporal_utils import metric_stages, temporal_delta
 
 
 def _pe_ratio_expr() -> pl.Expr:
     """P/E ratio: price / diluted earnings per share."""
-    return pl.when(pl.col("epsdil") != 0).then(
-        pl.col("price") / pl.col("epsdil")
-    ).otherwise(None)
+    return pl.col("price") / pl.col("epsdil").replace(0, None)
 
 
 def _pb_ratio_expr() -> pl.Expr:
     """P/B ratio: price / book value per share."""
-    return pl.when(pl.col("bvps") != 0).then(
-        pl.col("price") / pl.col("bvps")
-    ).otherwise(None)
+    return pl.col("price") / pl.col("bvps").replace(0, None)
 
 
 def _ps_ratio_expr() -> pl.Expr:
     """P/S ratio: price / sales per share."""
-    return pl.when(pl.col("sps") != 0).then(
-        pl.col("price") / pl.col("sps")
-    ).otherwise(None)
+    return pl.col("price") / pl.col("sps").replace(0, None)
 
 
 def _pc_ratio_expr() -> pl.Expr:
     """P/C ratio: price / cash per share."""
-    # Cash per share = cashneq / sharesbas
-    cash_per_share = pl.when(pl.col("sharesbas") != 0).then(
-        pl.col("cashneq") / pl.col("sharesbas")
-    ).otherwise(None)
-
-    return pl.when(cash_per_share != 0).then(
-        pl.col("price") / cash_per_share
-    ).otherwise(None)
+    # price / (cashneq / sharesbas), rearranged to a single division.
+    # Null when either shares or cash is zero, as cash per share is then undefined or zero.
+    return (
+        pl.col("price") * pl.col("sharesbas").replace(0, None)
+        / pl.col("cashneq").replace(0, None)
+    )
 
 
 def _ev_ebitda_ratio_expr() -> pl.Expr:
     """EV/EBITDA ratio: enterprise value / EBITDA."""
-    return pl.when(pl.col("ebitda") != 0).then(
-        pl.col("ev") / pl.col("ebitda")
-    ).otherwise(None)
+    return pl.col("ev") / pl.col("ebitda").replace(0, None)
 
 
 def get_fundamental_ratio_snapshot_expressions() -> list[pl.Expr]:
@@ -65,25 +55,24 @@ def get_fundamental_ratio_growth_expressions() -> list[pl.Expr]:
     Return temporal growth expressions for fundamental ratios.
 
     Note: For valuation ratios, "growth" represents absolute change (delta).
+    Needs the snapshot and lag_expressions() stages applied first.
     """
     return [
-        temporal_delta(_pe_ratio_expr(), 1).alias("pe_ratio_growth_qoq"),
-        temporal_delta(_pe_ratio_expr(), 4).alias("pe_ratio_growth_yoy"),
-        temporal_delta(_pb_ratio_expr(), 1).alias("pb_ratio_growth_qoq"),
-        temporal_delta(_pb_ratio_expr(), 4).alias("pb_ratio_growth_yoy"),
-        temporal_delta(_ps_ratio_expr(), 1).alias("ps_ratio_growth_qoq"),
-        temporal_delta(_ps_ratio_expr(), 4).alias("ps_ratio_growth_yoy"),
-        temporal_delta(_pc_ratio_expr(), 1).alias("pc_ratio_growth_qoq"),
-        temporal_delta(_pc_ratio_expr(), 4).alias("pc_ratio_growth_yoy"),
-        temporal_delta(_ev_ebitda_ratio_expr(), 1).alias("ev_ebitda_ratio_growth_qoq"),
-        temporal_delta(_ev_ebitda_ratio_expr(), 4).alias("ev_ebitda_ratio_growth_yoy"),
+        temporal_delta(pl.col("pe_ratio"), 1).alias("pe_ratio_growth_qoq"),
+        temporal_delta(pl.col("pe_ratio"), 4).alias("pe_ratio_growth_yoy"),
+        temporal_delta(pl.col("pb_ratio"), 1).alias("pb_ratio_growth_qoq"),
+        temporal_delta(pl.col("pb_ratio"), 4).alias("pb_ratio_growth_yoy"),
+        temporal_delta(pl.col("ps_ratio"), 1).alias("ps_ratio_growth_qoq"),
+        temporal_delta(pl.col("ps_ratio"), 4).alias("ps_ratio_growth_yoy"),
+        temporal_delta(pl.col("pc_ratio"), 1).alias("pc_ratio_growth_qoq"),
+        temporal_delta(pl.col("pc_ratio"), 4).alias("pc_ratio_growth_yoy"),
+        temporal_delta(pl.col("ev_ebitda_ratio"), 1).alias("ev_ebitda_ratio_growth_qoq"),
+        temporal_delta(pl.col("ev_ebitda_ratio"), 4).alias("ev_ebitda_ratio_growth_yoy"),
     ]
 
 
-def get_fundamental_ratio_expressions() -> list[pl.Expr]:
+def get_fundamental_ratio_expressions() -> list[list[pl.Expr]]:
     """
-    Return all fundamental ratio expressions (snapshot + growth).
-
-    Use this for efficient batch calculation with other metric types.
+    Return all fundamental ratio expressions as ordered with_columns stages (see metric_stages).
     """
-    return get_fundamental_ratio_snapshot_expressions() + get_fundamental_ratio_growth_expressions()
+    return metric_stages(get_fundamental_ratio_snapshot_expressions(), get_fundamental_ratio_growth_expressions())
@@ -2,7 +2,7 @@
 
 import polars as pl
 
-from fundamental_analysis.metrics.temporal_utils import temporal_change
+from fundamental_analysis.metrics.temporal_utils import metric_stages, temporal_change
 
 
 def _roe_expr() -> pl.Expr:
@@ -15,9 +15,7 @@ def _roe_expr() -> pl.Expr:
     Note: SF1 provides pre-calculated 'roe' column, but we calculate it here
     for transparency and consistency with other metrics.
     """
-    return pl.when(pl.col("equity") != 0).then(
-        pl.col("netinccmn") / pl.col("equity")
-    ).otherwise(None)
+    return pl.col("netinccmn") / pl.col("equity").replace(0, None)
 
 
 def _roic_expr() -> pl.Expr:
@@ -47,9 +45,7 @@ def _roic_expr() -> pl.Expr:
     invested_capital = pl.col("debt") + pl.col("equity") - pl.col("cashneq")
 
     # ROIC = NOPAT / Invested Capital
-    return pl.when(invested_capital != 0).then(
-        nopat / invested_capital
-    ).otherwise(None)
+    return nopat / invested_capital.replace(0, None)
 
 
 def get_profitability_snapshot_expressions() -> list[pl.Expr]:
@@ -71,19 +67,18 @@ def get_profitability_growth_expressions() -> list[pl.Expr]:
     Return temporal growth expressions for profitability metrics.
 
     Includes growth (QoQ and YoY) for ROE and ROIC.
+    Needs the snapshot and lag_expressions() stages applied first.
     """
     return [
-        temporal_change(_roe_expr(), 1, check_sign_crossing=True).alias("roe_calculated_growth_qoq"),
-        temporal_change(_roe_expr(), 4, check_sign_crossing=True).alias("roe_calculated_growth_yoy"),
-        temporal_change(_roic_expr(), 1, check_sign_crossing=True).alias("roic_calculated_growth_qoq"),
-        temporal_change(_roic_expr(), 4, check_sign_crossing=True).alias("roic_calculated_growth_yoy"),
+        temporal_change(pl.col("roe_calculated"), 1, check_sign_crossing=True).alias("roe_calculated_growth_qoq"),
+        temporal_change(pl.col("roe_calculated"), 4, check_sign_crossing=True).alias("roe_calculated_growth_yoy"),
+        temporal_change(pl.col("roic_calculated"), 1, check_sign_crossing=True).alias("roic_calculated_growth_qoq"),
+        temporal_change(pl.col("roic_calculated"), 4, check_sign_crossing=True).alias("roic_calculated_growth_yoy"),
     ]
 
 
-def get_profitability_expressions() -> list[pl.Expr]:
+def get_profitability_expressions() -> list[list[pl.Expr]]:
     """
-    Return all profitability metric expressions (snapshot + growth).
-
-    Use this for efficient batch calculation with other metric types.
+    Return all profitability metric expressions as ordered with_columns stages (see metric_stages).
     """
-    return get_profitability_snapshot_expressions() + get_profitability_growth_expressions()
+    return metric_stages(get_profitability_snapshot_expressions(), get_profitability_growth_expressions())
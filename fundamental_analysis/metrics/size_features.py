@@ -2,12 +2,17 @@
 
 import polars as pl
 
-from fundamental_analysis.metrics.temporal_utils import temporal_change
+from fundamental_analysis.metrics.temporal_utils import metric_stages, temporal_change
 
 # Raw size/fundamental features from SF1 (preserved separately by orchestrator)
 SIZE_FEATURE_RAW_COLUMNS = ["marketcap", "revenue", "netinc", "equity", "assets"]
 
 
+# Upper bounds (inclusive) of each market cap bucket below mega, ascending
+_MARKETCAP_CATEGORY_BOUNDS = pl.Series([300_000_000, 2_000_000_000, 10_000_000_000, 200_000_000_000], dtype=pl.Float64)
+_MARKETCAP_CATEGORY_LABELS = pl.Series(["micro", "small", "mid", "large", "mega"])
+
+
 def _marketcap_category_expr() -> pl.Expr:
     """
     Categorize market cap into standard size buckets.
@@ -18,20 +23,12 @@ def _marketcap_category_expr() -> pl.Expr:
     - Mid cap: $2B - $10B
     - Small cap: $300M - $2B
     - Micro cap: < $300M
+
+    The bucket index is a binary search over the bounds rather than a chain of
+    comparisons per row; non-positive market caps get null.
     """
-    return (
-        pl.when(pl.col("marketcap") > 200_000_000_000)
-        .then(pl.lit("mega"))
-        .when(pl.col("marketcap") > 10_000_000_000)
-        .then(pl.lit("large"))
-        .when(pl.col("marketcap") > 2_000_000_000)
-        .then(pl.lit("mid"))
-        .when(pl.col("marketcap") > 300_000_000)
-        .then(pl.lit("small"))
-        .when(pl.col("marketcap") > 0)
-        .then(pl.lit("micro"))
-        .otherwise(None)
-    )
+    bucket = pl.lit(_MARKETCAP_CATEGORY_BOUNDS).search_sorted(pl.col("marketcap"), side="left")
+    return pl.when(pl.col("marketcap") > 0).then(pl.lit(_MARKETCAP_CATEGORY_LABELS).gather(bucket))
 
 
 def get_size_snapshot_expressions() -> list[pl.Expr]:
@@ -69,10 +66,8 @@ def get_size_growth_expressions() -> list[pl.Expr]:
     ]
 
 
-def get_size_feature_expressions() -> list[pl.Expr]:
+def get_size_feature_expressions() -> list[list[pl.Expr]]:
     """
-    Return all size feature expressions (snapshot + growth).
-
-    Use this for efficient batch calculation with other metric types.
+    Return all size feature expressions as ordered with_columns stages (see metric_stages).
     """
-    return get_size_snapshot_expressions() + get_size_growth_expressions()
+    return metric_stages(get_size_snapshot_expressions(), get_size_growth_expressions())
@@ -1,7 +1,66 @@
-"""Temporal feature utilities for calculating growth and change metrics."""
+"""
+Temporal feature utilities for calculating growth and change metrics.
+
+Growth expressions read lagged copies of their base column (e.g. revenue__lag4)
+instead of embedding a window shift. Polars does not deduplicate window
+expressions, so an inline shift would be re-evaluated at every use; the lags are
+materialized once by lag_expressions() in earlier with_columns stages.
+
+The lags assume rows are sorted by (ticker, reportperiod), as
+calculate_all_metrics guarantees. Each ticker's rows are then contiguous, so a
+per-ticker shift is a plain shift masked where the row k back belongs to another
+ticker, which avoids grouping by ticker for every lag.
+"""
 
 import polars as pl
 
+_LAG_SEPARATOR = "__lag"
+
+
+def lag_column(column: str, shift: int) -> str:
+    """Name of the materialized column holding column shifted by shift periods."""
+    return f"{column}{_LAG_SEPARATOR}{shift}"
+
+
+def lag_expressions(growth_expressions: list[pl.Expr]) -> tuple[list[pl.Expr], list[pl.Expr]]:
+    """
+    Per-ticker shift expressions for every lag column read by growth_expressions, each once.
+
+    Returned as (mask, lag) stages for consecutive with_columns calls: the
+    same-ticker mask for each shift distance is materialized once and shared by
+    every lag at that distance.
+    """
+    masks = {}
+    lags = {}
+    for expr in growth_expressions:
+        for name in expr.meta.root_names():
+            column, separator, shift = name.rpartition(_LAG_SEPARATOR)
+            if not separator or name in lags:
+                continue
+            shift = int(shift)
+            mask_name = f"_same_ticker{_LAG_SEPARATOR}{shift}"
+            masks[mask_name] = (pl.col("ticker") == pl.col("ticker").shift(shift)).alias(mask_name)
+            lags[name] = pl.when(pl.col(mask_name)).then(pl.col(column).shift(shift)).alias(name)
+    return list(masks.values()), list(lags.values())
+
+
+def metric_stages(
+    snapshot_expressions: list[pl.Expr],
+    growth_expressions: list[pl.Expr],
+) -> list[list[pl.Expr]]:
+    """
+    Snapshot and growth expressions as ordered with_columns stages.
+
+    Returns [snapshot, same-ticker masks, lags, growth]; apply each stage in its own
+    with_columns, in order, to a frame sorted by (ticker, reportperiod).
+    """
+    masks, lags = lag_expressions(growth_expressions)
+    return [snapshot_expressions, masks, lags, growth_expressions]
+
+
+def _previous(base_expr: pl.Expr, shift: int) -> pl.Expr:
+    return pl.col(lag_column(base_expr.meta.output_name(), shift))
+
 
 def temporal_delta(base_expr: pl.Expr, shift: int) -> pl.Expr:
     """
@@ -10,11 +69,11 @@ def temporal_delta(base_expr: pl.Expr, shift: int) -> pl.Expr:
     Used for metrics where absolute change is more meaningful (e.g., ratio deltas).
 
     Args:
-        base_expr: The metric expression to calculate delta for
+        base_expr: Column to calculate delta for (a plain pl.col)
         shift: Number of periods to shift (1=QoQ, 4=YoY)
     """
     current = base_expr
-    previous = base_expr.shift(shift).over("ticker", order_by="reportperiod")
+    previous = _previous(base_expr, shift)
     return current - previous
 
 
@@ -27,7 +86,7 @@ def temporal_change(
     Calculate percentage change over time: (current - previous) / |previous|.
 
     Args:
-        base_expr: The metric expression to calculate percentage change for
+        base_expr: Column to calculate percentage change for (a plain pl.col)
         shift: Number of periods to shift (1=QoQ, 4=YoY)
         check_sign_crossing: If True, returns null when metric crosses zero
                              (avoids misleading change values for metrics that can be negative)
@@ -37,16 +96,15 @@ def temporal_change(
     - check_sign_crossing=True and current * previous < 0 (sign changed)
     """
     current = base_expr
-    previous = base_expr.shift(shift).over("ticker", order_by="reportperiod")
+    previous = _previous(base_expr, shift)
 
     if check_sign_crossing:
         # For metrics that can be negative (debt ratios, ROE, ROIC)
-        # Avoid misleading values when crossing zero
-        return pl.when((previous != 0) & (current * previous > 0)).then(
+        # Avoid misleading values when crossing zero.
+        # A zero previous makes the product zero, so this also covers previous != 0.
+        return pl.when(current * previous > 0).then(
             (current - previous) / previous.abs()
         ).otherwise(None)
     else:
         # For metrics that are always positive or where sign change is meaningful
-        return pl.when(previous != 0).then(
-            (current - previous) / previous.abs()
-        ).otherwise(None)
+        return (current - previous) / previous.abs().replace(0, None)
@@ -1,17 +1,34 @@
 """Options data fetcher using Polygon.io (Massive) API."""
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import numpy as np
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 API_KEY = os.getenv("MASSIVE_API_KEY")
 BASE_URL = "https://api.polygon.io"
-
-
-@dataclass
+REQUEST_TIMEOUT_SECONDS = 10
+MAX_CONCURRENT_TICKERS = 16
+
+# Shared session keeps connections (and TLS sessions) alive across requests
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+
+@dataclass(slots=True)
 class OptionQuote:
     ticker: str
     underlying: str
@@ -31,15 +48,15 @@ class OptionQuote:
     iv: float | None
     underlying_price: float
 
-    @property
-    def break_even(self) -> float:
-        if self.option_type == "call":
-            return self.strike + self.mid
-        return self.strike - self.mid
+    break_even: float = field(init=False, repr=False, compare=False)
+    break_even_pct: float = field(init=False, repr=False, compare=False)
 
-    @property
-    def break_even_pct(self) -> float:
-        return (self.break_even / self.underlying_price - 1) * 100
+    def __post_init__(self) -> None:
+        if self.option_type == "call":
+            self.break_even = self.strike + self.mid
+        else:
+            self.break_even = self.strike - self.mid
+        self.break_even_pct = (self.break_even / self.underlying_price - 1) * 100
 
     @property
     def moneyness(self) -> str:
@@ -66,8 +83,9 @@ class OptionsSummary:
         lines.append(f"  {self.ticker} Options Chain - Current Price: ${self.underlying_price:.2f}")
         lines.append(f"{'='*70}\n")
 
+        today = datetime.now().date()
         for exp, quotes in sorted(self.expirations.items()):
-            days_to_exp = (datetime.strptime(exp, "%Y-%m-%d").date() - datetime.now().date()).days
+            days_to_exp = (datetime.strptime(exp, "%Y-%m-%d").date() - today).days
             lines.append(f"Expiration: {exp} ({days_to_exp} days)")
             lines.append("-" * 70)
             lines.append(
@@ -96,7 +114,7 @@ def _get_underlying_price(ticker: str) -> float | None:
     url = f"{BASE_URL}/v2/aggs/ticker/{ticker}/prev"
     params = {"apiKey": API_KEY}
 
-    response = requests.get(url, params=params)
+    response = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
     if response.status_code != 200:
         return None
 
@@ -119,11 +137,6 @@ def _get_options_chain(
     min_exp = today + timedelta(days=min_days)
     max_exp = today + timedelta(days=max_days)
 
-    # First get underlying price
-    underlying_price = _get_underlying_price(ticker)
-    if not underlying_price:
-        raise ValueError(f"Could not fetch underlying price for {ticker}")
-
     # Fetch options snapshot
     url = f"{BASE_URL}/v3/snapshot/options/{ticker}"
     params = {
@@ -136,7 +149,7 @@ def _get_options_chain(
         "sort": "expiration_date",
     }
 
-    response = requests.get(url, params=params)
+    response = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
     response.raise_for_status()
     data = response.json()
 
@@ -144,12 +157,22 @@ def _get_options_chain(
         raise ValueError(f"API error: {data}")
 
     quotes = []
+    # Only needed when the snapshot omits underlying_asset.price; fetched at most once
+    fallback_price = None
     for result in data.get("results", []):
         details = result.get("details", {})
         day = result.get("day", {})
         greeks = result.get("greeks", {})
         underlying = result.get("underlying_asset", {})
 
+        underlying_price = underlying.get("price")
+        if not underlying_price:
+            if fallback_price is None:
+                fallback_price = _get_underlying_price(ticker)
+                if not fallback_price:
+                    raise ValueError(f"Could not fetch underlying price for {ticker}")
+            underlying_price = fallback_price
+
         quote = OptionQuote(
             ticker=details.get("ticker", ""),
             underlying=ticker,
@@ -167,7 +190,7 @@ def _get_options_chain(
             theta=greeks.get("theta"),
             vega=greeks.get("vega"),
             iv=result.get("implied_volatility"),
-            underlying_price=underlying.get("price") or underlying_price,
+            underlying_price=underlying_price,
         )
         quotes.append(quote)
 
@@ -200,28 +223,18 @@ def get_options_summary(
     # For each expiration, find ATM and key OTM strikes
     expirations: dict[str, list[OptionQuote]] = {}
 
-    for exp, exp_quotes in by_expiration.items():
-        # Sort by distance from ATM
-        exp_quotes.sort(key=lambda q: abs(q.strike - underlying_price))
-
-        selected = []
-        # ATM (closest to current price)
-        if exp_quotes:
-            selected.append(exp_quotes[0])
+    # ATM (closest to current price), then ~10% OTM, ~20% OTM, ~30% OTM
+    otm_sign = 1 if option_type == "call" else -1
+    targets = underlying_price * (1 + otm_sign * np.array([0, 10, 20, 30]) / 100)
 
-        # Find ~10% OTM, ~20% OTM, ~30% OTM
-        for target_pct in [10, 20, 30]:
-            if option_type == "call":
-                target_strike = underlying_price * (1 + target_pct / 100)
-            else:
-                target_strike = underlying_price * (1 - target_pct / 100)
-
-            closest = min(exp_quotes, key=lambda q: abs(q.strike - target_strike), default=None)
-            if closest and closest not in selected:
-                selected.append(closest)
+    for exp, exp_quotes in by_expiration.items():
+        strikes = np.fromiter((q.strike for q in exp_quotes), dtype=np.float64, count=len(exp_quotes))
+        # Scan candidates in order of distance from ATM, so ties resolve toward ATM
+        by_atm = np.argsort(np.abs(strikes - underlying_price), kind="stable")
+        nearest = by_atm[np.abs(strikes[by_atm, None] - targets).argmin(axis=0)]
 
-        selected.sort(key=lambda q: q.strike)
-        expirations[exp] = selected
+        selected = sorted(dict.fromkeys(nearest.tolist()), key=lambda i: strikes[i])
+        expirations[exp] = [exp_quotes[i] for i in selected]
 
     return OptionsSummary(
         ticker=ticker,
@@ -230,3 +243,18 @@ def get_options_summary(
     )
 
 
+def get_options_summaries(
+    tickers: list[str],
+    min_days: int = 150,
+    max_days: int = 400,
+    option_type: str = "call",
+) -> list[OptionsSummary]:
+    """Get options summaries for several tickers, fetched concurrently.
+
+    Results are in the same order as tickers.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TICKERS) as executor:
+        return list(executor.map(
+            lambda ticker: get_options_summary(ticker, min_days, max_days, option_type),
+            tickers,
+        ))
@@ -6,7 +6,7 @@ import polars as pl
 TRADING_DAYS_PER_YEAR = 252
 
 
-def calculate_price_metrics(df_sep: pl.DataFrame) -> pl.DataFrame:
+def calculate_price_metrics(df_sep: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
     """
     Calculate price-based metrics for each ticker and date.
 
@@ -14,13 +14,15 @@ def calculate_price_metrics(df_sep: pl.DataFrame) -> pl.DataFrame:
 
     Parameters
     ----------
-    df_sep : pl.DataFrame
-        SEP price data with columns: ticker, date, closeadj, high, low
+    df_sep : pl.DataFrame or pl.LazyFrame
+        SEP price data with columns: ticker, date, closeadj, high, low.
+        A LazyFrame input returns a LazyFrame, so callers can chain further
+        lazy steps or pick the engine when collecting.
 
     Returns
     -------
-    pl.DataFrame
-        DataFrame with columns:
+    pl.DataFrame or pl.LazyFrame
+        Frame with columns:
         - ticker, date, closeadj (original)
         - return_1y: 1-year return
         - return_5y_or_longest: 5-year return (or longest available)
@@ -32,112 +34,85 @@ def calculate_price_metrics(df_sep: pl.DataFrame) -> pl.DataFrame:
         - volatility_1y: annualized volatility (std dev of daily returns)
         - pct_from_sma_200: % difference from 200-day SMA
     """
-    # Ensure sorted by ticker and date
-    df = df_sep.select(["ticker", "date", "closeadj"]).sort("ticker", "date")
-
-    # Calculate daily returns
-    df = df.with_columns([
-        (pl.col("closeadj") / pl.col("closeadj").shift(1).over("ticker") - 1)
-        .alias("daily_return")
-    ])
-
     # Define window sizes
     days_1y = TRADING_DAYS_PER_YEAR
     days_5y = TRADING_DAYS_PER_YEAR * 5
     days_200 = 200
 
-    # 1-year return with base price
+    # Ensure sorted by ticker and date. Float32 halves memory traffic through the
+    # rolling windows; the returns and ratios below need nowhere near 15 digits.
+    df = (
+        df_sep.lazy()
+        .select(["ticker", "date", pl.col("closeadj").cast(pl.Float32)])
+        .sort("ticker", "date")
+    )
+
+    # Stage 1: per-ticker shifts and rolling windows over closeadj.
+    # Kept in one with_columns so the windows run in a single parallel pass;
+    # the 5y high doubles as the running max for the 5y drawdown.
     df = df.with_columns([
+        # Daily returns
+        pl.col("closeadj").pct_change().over("ticker").alias("daily_return"),
+        # 1-year base price
         pl.col("closeadj").shift(days_1y).over("ticker").alias("_price_1y_ago"),
-        (pl.col("closeadj") / pl.col("closeadj").shift(days_1y).over("ticker") - 1)
-        .alias("return_1y")
+        # Row number within each ticker, to know how much history we have
+        pl.col("ticker").cum_count().over("ticker").alias("_row_num"),
+        # Rolling high/low for 5 years (or available history)
+        pl.col("closeadj").rolling_max(window_size=days_5y, min_samples=1).over("ticker")
+        .alias("_high_5y"),
+        pl.col("closeadj").rolling_min(window_size=days_5y, min_samples=1).over("ticker")
+        .alias("_low_5y"),
+        # Running max for 1y window
+        pl.col("closeadj").rolling_max(window_size=days_1y, min_samples=1).over("ticker")
+        .alias("_running_max_1y"),
+        # 200-day SMA
+        pl.col("closeadj").rolling_mean(window_size=days_200, min_samples=days_200).over("ticker")
+        .alias("_sma_200"),
     ])
 
-    # 5-year (or longest) return
-    # First, calculate the row number within each ticker to know how much history we have
+    # Stage 2: values derived from stage 1 columns
     df = df.with_columns([
-        pl.col("ticker").cum_count().over("ticker").alias("_row_num")
-    ])
+        (pl.col("closeadj") / pl.col("_price_1y_ago") - 1).alias("return_1y"),
 
-    # Price from 5 years ago (or earliest available)
-    df = df.with_columns([
         # Get the price from 5y ago, or earliest if less history
         pl.when(pl.col("_row_num") >= days_5y)
         .then(pl.col("closeadj").shift(days_5y).over("ticker"))
         .otherwise(pl.col("closeadj").first().over("ticker"))
         .alias("_price_5y_ago"),
 
-        # Track how many days back we're comparing
-        pl.when(pl.col("_row_num") >= days_5y)
-        .then(pl.lit(days_5y))
-        .otherwise(pl.col("_row_num"))
-        .alias("return_period_days"),
-    ])
+        # Track how many days back we're comparing; a clip rather than a second
+        # evaluation of the 5y-history predicate above
+        pl.col("_row_num").clip(upper_bound=days_5y).alias("return_period_days"),
 
-    df = df.with_columns([
-        (pl.col("closeadj") / pl.col("_price_5y_ago") - 1).alias("return_5y_or_longest")
-    ])
-
-    # Rolling high/low for 5 years (or available history)
-    df = df.with_columns([
-        pl.col("closeadj").rolling_max(window_size=days_5y, min_samples=1).over("ticker")
-        .alias("_high_5y"),
-        pl.col("closeadj").rolling_min(window_size=days_5y, min_samples=1).over("ticker")
-        .alias("_low_5y"),
-    ])
-
-    # Pct from high/low
-    df = df.with_columns([
+        # Pct from high/low
         (pl.col("closeadj") / pl.col("_high_5y") - 1).alias("pct_from_high_5y"),
         (pl.col("closeadj") / pl.col("_low_5y") - 1).alias("pct_from_low_5y"),
-    ])
 
-    # Max drawdown calculation
-    # Drawdown = (current price - running max) / running max
-    df = df.with_columns([
-        # Running max for 1y window
-        pl.col("closeadj").rolling_max(window_size=days_1y, min_samples=1).over("ticker")
-        .alias("_running_max_1y"),
-        # Running max for 5y window
-        pl.col("closeadj").rolling_max(window_size=days_5y, min_samples=1).over("ticker")
-        .alias("_running_max_5y"),
-    ])
-
-    df = df.with_columns([
-        # Drawdown at each point
+        # Drawdown = (current price - running max) / running max
         ((pl.col("closeadj") - pl.col("_running_max_1y")) / pl.col("_running_max_1y"))
         .alias("_drawdown_1y"),
-        ((pl.col("closeadj") - pl.col("_running_max_5y")) / pl.col("_running_max_5y"))
+        ((pl.col("closeadj") - pl.col("_high_5y")) / pl.col("_high_5y"))
         .alias("_drawdown_5y"),
+
+        # Volatility (annualized std dev of daily returns)
+        (pl.col("daily_return").rolling_var(window_size=days_1y, min_samples=20).over("ticker")
+         * TRADING_DAYS_PER_YEAR).sqrt()
+        .alias("volatility_1y"),
+
+        (pl.col("closeadj") / pl.col("_sma_200") - 1).alias("pct_from_sma_200"),
     ])
 
-    # Max drawdown is the minimum (most negative) drawdown in the period
+    # Stage 3: max drawdown is the minimum (most negative) drawdown in the period
     df = df.with_columns([
+        (pl.col("closeadj") / pl.col("_price_5y_ago") - 1).alias("return_5y_or_longest"),
         pl.col("_drawdown_1y").rolling_min(window_size=days_1y, min_samples=1).over("ticker")
         .alias("max_drawdown_1y"),
         pl.col("_drawdown_5y").rolling_min(window_size=days_5y, min_samples=1).over("ticker")
         .alias("max_drawdown_5y"),
     ])
 
-    # Volatility (annualized std dev of daily returns)
-    df = df.with_columns([
-        (pl.col("daily_return").rolling_std(window_size=days_1y, min_samples=20).over("ticker")
-         * (TRADING_DAYS_PER_YEAR ** 0.5))
-        .alias("volatility_1y")
-    ])
-
-    # 200-day SMA and pct from it
-    df = df.with_columns([
-        pl.col("closeadj").rolling_mean(window_size=days_200, min_samples=days_200).over("ticker")
-        .alias("_sma_200")
-    ])
-
-    df = df.with_columns([
-        (pl.col("closeadj") / pl.col("_sma_200") - 1).alias("pct_from_sma_200")
-    ])
-
     # Select final columns, renaming underscore-prefixed temps to output names
-    return df.select([
+    df = df.select([
         "ticker", "date", "closeadj",
         pl.col("_price_1y_ago").alias("price_1y_ago"), "return_1y",
         pl.col("_price_5y_ago").alias("price_5y_ago"), "return_5y_or_longest", "return_period_days",
@@ -147,3 +122,20 @@ def calculate_price_metrics(df_sep: pl.DataFrame) -> pl.DataFrame:
         "volatility_1y",
         pl.col("_sma_200").alias("sma_200"), "pct_from_sma_200",
     ])
+    if isinstance(df_sep, pl.LazyFrame):
+        return df
+    # The in-memory engine runs these per-ticker windows faster than the
+    # streaming default when the whole frame is already in memory
+    return df.collect(engine="in-memory")
+
+
+def calculate_price_metrics_stream(lf_sep: pl.LazyFrame) -> pl.DataFrame:
+    """
+    calculate_price_metrics for SEP histories too large to hold in memory at once.
+
+    Pass a lazy scan (e.g. pl.scan_parquet of the monthly SEP files); the plan is
+    run on the streaming engine, which reads only ticker, date and closeadj and
+    processes the input in batches instead of materializing every intermediate
+    column for the full history.
+    """
+    return calculate_price_metrics(lf_sep).collect(engine="streaming")
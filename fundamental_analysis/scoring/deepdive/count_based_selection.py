@@ -88,32 +88,13 @@ def calculate_signal_counts(
             favorable_condition = pl.col(percentile_col) >= percentile_threshold
             unfavorable_condition = pl.col(percentile_col) <= outlier_cutoff
 
-        # Add favorable condition with null check
-        favorable_conditions.append(
-            pl.when(
-                pl.col(percentile_col).is_not_null() &
-                favorable_condition
-            )
-            .then(1)
-            .otherwise(0)
-        )
-
-        # Add unfavorable condition with null check
-        unfavorable_conditions.append(
-            pl.when(
-                pl.col(percentile_col).is_not_null() &
-                unfavorable_condition
-            )
-            .then(1)
-            .otherwise(0)
-        )
+        # Boolean conditions cast to 0/1 counts; the null check keeps them non-null
+        is_available = pl.col(percentile_col).is_not_null()
+        favorable_conditions.append((is_available & favorable_condition).cast(pl.Int32))
+        unfavorable_conditions.append((is_available & unfavorable_condition).cast(pl.Int32))
 
         # Count available metrics
-        available_conditions.append(
-            pl.when(pl.col(percentile_col).is_not_null())
-            .then(1)
-            .otherwise(0)
-        )
+        available_conditions.append(is_available.cast(pl.Int32))
 
     # Add count columns
     df = df.with_columns([
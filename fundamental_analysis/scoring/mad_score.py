@@ -34,9 +34,10 @@ def _calculate_mad_scores(
 
     segment_col = option.segment_col
 
-    # Ensure sorted by segment
-    df = df.sort(segment_col)
-
+    median_exprs = []
+    mad_exprs = []
+    score_exprs = []
+    output_columns = list(df.columns)
     for metric in metrics:
         # Build filter condition
         filter_cond = pl.col(metric).is_not_null() & pl.col(metric).is_finite()
@@ -44,26 +45,26 @@ def _calculate_mad_scores(
             filter_cond = filter_cond & (pl.col(metric) > 0)
 
         # Calculate median within segment
-        df = df.with_columns([
+        median_exprs.append(
             pl.when(filter_cond)
             .then(pl.col(metric).median().over(segment_col))
             .otherwise(None)
-            .alias(f"{metric}_median"),
-        ])
+            .alias(f"{metric}_median")
+        )
 
         # Calculate MAD = median(|value - median|) within segment
-        df = df.with_columns([
+        mad_exprs.append(
             pl.when(filter_cond)
             .then(
                 (pl.col(metric) - pl.col(f"{metric}_median")).abs()
                 .median().over(segment_col)
             )
             .otherwise(None)
-            .alias(f"{metric}_mad"),
-        ])
+            .alias(f"{metric}_mad")
+        )
 
         # Calculate MAD score = 0.6745 * (value - median) / MAD
-        df = df.with_columns([
+        score_exprs.extend([
             pl.when(filter_cond & (pl.col(f"{metric}_mad") > 0))
             .then(
                 MAD_CONSTANT * (pl.col(metric) - pl.col(f"{metric}_median")) /
@@ -79,7 +80,22 @@ def _calculate_mad_scores(
             .alias(f"{metric}_population"),
         ])
 
-    return df
+        output_columns.extend([
+            f"{metric}_median", f"{metric}_mad", f"{metric}_mad_score", f"{metric}_population",
+        ])
+
+    # One lazy plan for all metrics: each of the three dependent stages runs for
+    # every metric at once, instead of three with_columns round trips per metric
+    return (
+        df.lazy()
+        # Ensure sorted by segment
+        .sort(segment_col)
+        .with_columns(median_exprs)
+        .with_columns(mad_exprs)
+        .with_columns(score_exprs)
+        .select(output_columns)
+        .collect(engine="in-memory")
+    )
 
 
 def calculate_metric_mad_scores(
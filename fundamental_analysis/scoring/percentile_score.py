@@ -29,9 +29,7 @@ def _calculate_rolling_percentiles(
     segment_col = option.segment_col
     date_col = option.date_col
 
-    # Ensure sorted by segment and date
-    df = df.sort(segment_col, date_col)
-
+    percentile_exprs = []
     for metric in metrics:
         # Build filter condition
         filter_cond = pl.col(metric).is_not_null() & pl.col(metric).is_finite()
@@ -40,7 +38,7 @@ def _calculate_rolling_percentiles(
 
         # Calculate rank-based percentile within each segment
         # Using all historical data up to each point (cumulative rank)
-        df = df.with_columns([
+        percentile_exprs.extend([
             pl.when(filter_cond)
             .then(
                 # Cumulative rank within segment (how many previous values are less than current)
@@ -75,7 +73,15 @@ def _calculate_rolling_percentiles(
             .alias(f"{metric}_p90"),
         ])
 
-    return df
+    # Metrics are independent, so all of them run as one parallel stage of a
+    # single lazy plan rather than a with_columns round trip per metric
+    return (
+        df.lazy()
+        # Ensure sorted by segment and date
+        .sort(segment_col, date_col)
+        .with_columns(percentile_exprs)
+        .collect(engine="in-memory")
+    )
 
 
 def calculate_metric_percentiles(
@@ -1,7 +1,5 @@
 """Z-score calculation for fundamental metrics."""
 
-from datetime import timedelta
-
 import polars as pl
 
 from fundamental_analysis.scoring.common import ALL_METRICS, ScoreOption
@@ -47,100 +45,64 @@ def _calculate_rolling_z_scores(
     date_col = option.date_col
     window_days = option.window_days
 
-    # Ensure sorted by segment and date
-    df = df.sort(segment_col, date_col)
-
-    # For each unique (datekey, segment), calculate rolling window stats
-    # Strategy: For each row, we'll calculate stats using join_asof with a time window
-
-    # Create a dataframe with all unique (datekey, segment) combinations
-    unique_dates_segments = df.select([date_col, segment_col]).unique()
+    # Rolling window [D - window_days, D] over each segment's rows. Windows are
+    # defined by date, so rows sharing a (datekey, segment) get identical stats.
+    window = f"{window_days}d"
 
-    # For each metric, calculate rolling stats
+    valid_value_exprs = []
+    stats_exprs = []
+    zscore_exprs = []
+    output_columns = list(df.columns)
     for metric in metrics:
-        df_valid = df.filter(
-            pl.col(metric).is_not_null() & pl.col(metric).is_finite()
-        ).select([date_col, segment_col, metric])
-
-        # Filter to valid data for this metric
-        # If metric requires positive values only, add that filter
+        # Only valid values contribute to the window stats. The masked value is
+        # materialized once and read by the count, mean, std and z-score.
+        valid = pl.col(metric).is_not_null() & pl.col(metric).is_finite()
         if metric in positive_only_metrics:
-            df_valid = df_valid.filter(
-                (pl.col(metric) > 0)
-            )
-
-        # For each unique (datekey, segment), calculate stats from rolling window
-        stats_list = []
-
-        for row in unique_dates_segments.iter_rows(named=True):
-            current_date = row[date_col]
-            current_segment = row[segment_col]
-
-            # Calculate window bounds
-            window_start = current_date - timedelta(days=window_days)
-
-            # Filter to window
-            window_data = df_valid.filter(
-                (pl.col(segment_col) == current_segment) &
-                (pl.col(date_col) >= window_start) &
-                (pl.col(date_col) <= current_date)
-            )
-
-            # Calculate stats
-            if len(window_data) > 1:
-                stats = window_data.select([
-                    pl.col(metric).mean().alias("mean"),
-                    pl.col(metric).std().alias("std"),
-                ]).to_dicts()[0]
-
-                stats_list.append({
-                    date_col: current_date,
-                    segment_col: current_segment,
-                    f"{metric}_mean": stats["mean"],
-                    f"{metric}_std": stats["std"],
-                })
-            else:
-                # Not enough data in window
-                stats_list.append({
-                    date_col: current_date,
-                    segment_col: current_segment,
-                    f"{metric}_mean": None,
-                    f"{metric}_std": None,
-                })
-
-        # Convert to dataframe and join back to original df
-        df_stats = pl.DataFrame(stats_list)
-        df = df.join(
-            df_stats,
-            on=[date_col, segment_col],
-            how="left"
+            valid = valid & (pl.col(metric) > 0)
+        valid_value_exprs.append(pl.when(valid).then(pl.col(metric)).alias(f"_{metric}_valid"))
+        value = pl.col(f"_{metric}_valid")
+
+        # Stats need more than one value in the window; rows without a segment get none
+        window_count = (
+            value.is_not_null().cast(pl.UInt32)
+            .rolling_sum_by(date_col, window, closed="both").over(segment_col)
         )
+        has_stats = (window_count > 1) & pl.col(segment_col).is_not_null()
+
+        stats_exprs.extend([
+            pl.when(has_stats)
+            .then(value.rolling_mean_by(date_col, window, closed="both").over(segment_col))
+            .alias(f"{metric}_mean"),
+            pl.when(has_stats)
+            .then(value.rolling_std_by(date_col, window, closed="both").over(segment_col))
+            .alias(f"{metric}_std"),
+        ])
 
         # Calculate z-scores
-        # If this metric requires positive values, only calculate z-score for positive values
-        if metric in positive_only_metrics:
-            df = df.with_columns([
-                pl.when(
-                    pl.col(metric).is_not_null() &
-                    pl.col(metric).is_finite() &
-                    (pl.col(metric) > 0)
-                )
-                .then(
-                    (pl.col(metric) - pl.col(f"{metric}_mean")) /
-                    pl.col(f"{metric}_std")
-                )
-                .otherwise(None)
-                .alias(f"{metric}_zscore")
-            ])
-        else:
-            df = df.with_columns([
-                (
-                    (pl.col(metric) - pl.col(f"{metric}_mean")) /
-                    pl.col(f"{metric}_std")
-                ).alias(f"{metric}_zscore")
-            ])
-
-    return df
+        # Positive-only metrics score the masked value, so non-positive values get null
+        scored = value if metric in positive_only_metrics else pl.col(metric)
+        zscore_exprs.append(
+            ((scored - pl.col(f"{metric}_mean")) / pl.col(f"{metric}_std")).alias(f"{metric}_zscore")
+        )
+
+        output_columns.extend([f"{metric}_mean", f"{metric}_std", f"{metric}_zscore"])
+
+    # One plan for all metrics: every metric's windows run in a single parallel
+    # stage, then all z-scores, instead of a with_columns round trip per metric.
+    # Segment windows need each whole partition, so the in-memory engine beats
+    # the streaming default here.
+    # Metrics are scored in Float32 (as calculate_all_metrics already emits them):
+    # half the bytes through the rolling windows, ample precision for ratios
+    return (
+        df.lazy()
+        .sort(segment_col, date_col)
+        .with_columns(pl.col(metric).cast(pl.Float32) for metric in metrics)
+        .with_columns(valid_value_exprs)
+        .with_columns(stats_exprs)
+        .with_columns(zscore_exprs)
+        .select(output_columns)
+        .collect(engine="in-memory")
+    )
 
 
 def calculate_metric_z_scores(
@@ -21,6 +21,7 @@ class Config:
     RAW_DATA_DIR = DATA_DIR / "raw"
     PROCESSED_DATA_DIR = DATA_DIR / "processed"
     RESULTS_DIR = PROJECT_ROOT / "results"
+    API_CACHE_DIR = DATA_DIR / "api_cache"
 
     # Raw data subdirectories
     SF1_DIR = RAW_DATA_DIR / "sf1"
@@ -45,6 +46,16 @@ class Config:
     BULK_DOWNLOAD_URL = "https://data.nasdaq.com/api/v3/datatables"
     MAX_RETRIES = 3
     RETRY_DELAY = 5  # seconds
+    # Concurrent API requests for batched SF1/SEP fetches
+    FETCH_CONCURRENCY = 8
+    # Months of SEP per API request; ~6k tickers x ~63 trading days stays under
+    # nasdaqdatalink's 1M-row pagination limit
+    SEP_FETCH_BATCH_MONTHS = 3
+    # Tickers per SF1 API request
+    SF1_FETCH_TICKER_BATCH_SIZE = 500
+    # Lifetime of cached API responses (only TICKERS is cached; SF1 and SEP are
+    # kept as snapshot/month files instead)
+    API_CACHE_TTL_SECONDS = 3600
 
     @classmethod
     def validate(cls):
@@ -64,5 +75,6 @@ class Config:
             cls.SF1_DIR,
             cls.SEP_DIR,
             cls.TICKERS_DIR,
+            cls.API_CACHE_DIR,
         ]:
             directory.mkdir(parents=True, exist_ok=True)
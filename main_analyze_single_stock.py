@@ -28,17 +28,15 @@ def llm_readable_cache(get_llm_analysis_):
     def with_caching(ticker: str, as_of_date_str: str, metrics_str: str) -> str:
         key = f"{ticker}_{as_of_date_str}"
 
-        # Load existing cache
-        cache = {}
+        # Stream the cache with a large buffer and stop at the first hit;
+        # keys are only appended when missing, so the first match is the only one.
         if cache_file.exists():
-            for line in cache_file.read_text().splitlines():
-                if line.strip():
-                    entry = json.loads(line)
-                    cache[entry["key"]] = entry
-
-        # Return cached result if exists
-        if key in cache:
-            return cache[key]["analysis"]
+            with cache_file.open("rb", buffering=1 << 20) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry["key"] == key:
+                            return entry["analysis"]
 
         result = get_llm_analysis_(ticker, as_of_date_str, metrics_str)
 
@@ -106,7 +104,7 @@ def analyze_stock(ticker: str, as_of_date: str, window_days: int = 180, use_llm:
         return
 
     # Check if ticker exists
-    if ticker not in df["ticker"].unique().to_list():
+    if not (df["ticker"] == ticker).any():
         print(f"Ticker {ticker} not found in data")
         return
 
@@ -25,7 +25,7 @@ def parse_args():
     parser.add_argument(
         "--overwrite",
         action="store_true",
-        help="Overwrite existing files (default: skip existing files)",
+        help="Overwrite existing files and bypass the API response cache (default: skip existing files)",
     )
 
     return parser.parse_args()
@@ -43,7 +43,7 @@ def main():
     logger.info("=" * 60)
 
     try:
-        fetcher = DataFetcher()
+        fetcher = DataFetcher(use_cache=not args.overwrite)
         fetcher.fetch_all(
             end_date=args.end_date,
             overwrite=args.overwrite,
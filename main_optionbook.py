@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """Test script for options data fetching."""
 import argparse
-from fundamental_analysis.optionbook.optionbook import get_options_summary
+from fundamental_analysis.optionbook.optionbook import get_options_summaries
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Fetch options chain for a ticker")
-    parser.add_argument("ticker", help="Stock ticker symbol (e.g., AAPL)")
+    parser = argparse.ArgumentParser(description="Fetch options chains for one or more tickers")
+    parser.add_argument("tickers", nargs="+", help="Stock ticker symbols (e.g., AAPL MSFT)")
     parser.add_argument(
         "--min-days", type=int, default=150,
         help="Minimum days to expiration (default: 150 for 90-day hold + buffer)"
@@ -21,22 +21,26 @@ def main():
     )
     args = parser.parse_args()
 
-    print(f"\nFetching {args.type}s for {args.ticker}...")
+    tickers = [ticker.upper() for ticker in args.tickers]
+
+    print(f"\nFetching {args.type}s for {', '.join(tickers)}...")
     print(f"Expiration range: {args.min_days} - {args.max_days} days\n")
 
     try:
-        summary = get_options_summary(
-            ticker=args.ticker.upper(),
+        # Tickers are fetched concurrently; summaries come back in argument order
+        summaries = get_options_summaries(
+            tickers=tickers,
             min_days=args.min_days,
             max_days=args.max_days,
             option_type=args.type,
         )
 
-        if not summary.expirations:
-            print(f"No options found for {args.ticker} in the specified range.")
-            return
+        for summary in summaries:
+            if not summary.expirations:
+                print(f"No options found for {summary.ticker} in the specified range.")
+                continue
 
-        print(summary.format_table())
+            print(summary.format_table())
 
     except Exception as e:
         print(f"Error: {e}")